@@ -1,13 +1,38 @@
 import os
+import re
+import math
+import json
+import orjson
+import hashlib
+import queue
+import atexit
+import asyncio
 import logging
+import logging.handlers
+import time
+import sqlite3
+import platform
+import threading
+import httpx
 import torch
+import uvicorn
+import requests
+import numpy as np
+import pandas as pd
 import yfinance as yf
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from dataclasses import dataclass
+from cachetools import LRUCache, TTLCache
 from typing import Dict, List, Tuple, Optional
 from dotenv import load_dotenv
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-from groq import Groq
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from quart import Quart, Response, request
+from quart_cors import cors
+from werkzeug.exceptions import HTTPException
+from groq import AsyncGroq, DefaultAioHttpClient
+from transformers import AutoTokenizer, AutoModelForSequenceClassification, PreTrainedTokenizerFast
+from transformers.utils import cached_file
 
 # Load environment variables
 load_dotenv()
@@ -16,14 +41,16 @@ load_dotenv()
 # CONFIGURATION
 # ============================================================================
 
+@dataclass(frozen=True, slots=True)
 class Settings:
     # API Settings
     API_TITLE: str = "FinSight API"
     API_VERSION: str = "2.0.0"
     API_HOST: str = "0.0.0.0"
     API_PORT: int = int(os.getenv("API_PORT", "8000"))
+    API_WORKERS: int = int(os.getenv("API_WORKERS", "1")) or os.cpu_count() or 1
     
-    # Flask Settings
+    # App Settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
     DEBUG: bool = os.getenv("DEBUG", "true").lower() == "true"
     
@@ -33,22 +60,148 @@ class Settings:
     # Groq API Settings
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
     GROQ_MODEL: str = "llama3-70b-8192"
+    GROQ_TIMEOUT: float = 30.0
+    GROQ_CONNECT_TIMEOUT: float = 5.0
+    GROQ_MAX_CONNECTIONS: int = 100
+    GROQ_MAX_KEEPALIVE_CONNECTIONS: int = 50
     
     # Model Settings
     FINBERT_MODEL: str = "yiyanghkust/finbert-tone"
+    FINBERT_MODEL_REV: str = os.getenv("FINBERT_MODEL_REV", "main")
     MAX_TEXT_LENGTH: int = 512
+    MIN_ARTICLE_LENGTH: int = 100
+    MAX_CONTENT_LENGTH: int = 256 * 1024
+    MODELS_DIR: str = os.getenv("MODELS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models"))
+    
+    # FinBERT Runtime Settings ("torch", "torchscript" or "onnx")
+    FINBERT_BACKEND: str = os.getenv("FINBERT_BACKEND", "torch").lower()
+    ORT_NUM_THREADS: int = int(os.getenv("ORT_NUM_THREADS", "0"))
+    TORCH_NUM_THREADS: int = int(os.getenv("TORCH_NUM_THREADS", "0"))
+    FINBERT_BF16: bool = os.getenv("FINBERT_BF16", "false").lower() == "true"
+    FINBERT_COMPILE: str = os.getenv("FINBERT_COMPILE", "auto").lower()  # "true", "false" or "auto" (GPU only)
+    FINBERT_QUANTIZE: bool = os.getenv("FINBERT_QUANTIZE", "false").lower() == "true"
+    FINBERT_BATCH_WINDOW_MS: float = float(os.getenv("FINBERT_BATCH_WINDOW_MS", "10"))
+    
+    # Fast Mode Settings (VADER, falls back to FinBERT when |compound| is below the threshold)
+    VADER_THRESHOLD: float = float(os.getenv("VADER_THRESHOLD", "0.3"))
+    
+    # Cache Settings
+    TICKER_CACHE_SIZE: int = 4096
+    TICKER_CACHE_TTL: int = int(os.getenv("TICKER_CACHE_TTL", "86400"))
+    SENTIMENT_CACHE_SIZE: int = 2048
+    STOCK_CACHE_SIZE: int = 1024
+    STOCK_CACHE_TTL: int = int(os.getenv("STOCK_CACHE_TTL", "60"))
+    MARKET_CAP_CACHE_TTL: int = int(os.getenv("MARKET_CAP_CACHE_TTL", "3600"))
+    
+    # YFinance Settings
+    YF_BATCH_SIZE: int = 20
 
 settings = Settings()
 
+# Hot settings resolved once at import so request handlers never re-read them
+GROQ_KEY = settings.GROQ_API_KEY
+_GROQ_CONFIGURED = bool(GROQ_KEY)
+
 # ============================================================================
 # LOGGING CONFIGURATION
 # ============================================================================
 
+# Request threads only enqueue records; a background listener thread does the
+# formatting and the blocking stderr writes.
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO if settings.DEBUG else logging.WARNING)
+
+# ============================================================================
+# TICKER CACHE
+# ============================================================================
+
+class TickerCache:
+    """TTL-bounded LRU of company -> ticker mappings, backed by SQLite on disk"""
+    
+    def __init__(self, path: str, maxsize: int, ttl: int):
+        self.ttl = ttl
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tickers ("
+            "company TEXT PRIMARY KEY, ticker TEXT NOT NULL, updated_at REAL NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(tickers)")}
+        if "updated_at" not in columns:
+            self._db.execute("ALTER TABLE tickers ADD COLUMN updated_at REAL NOT NULL DEFAULT 0")
+        # Expired rows are never served again, so drop them instead of letting the file grow
+        self._db.execute("DELETE FROM tickers WHERE updated_at < ?", (time.time() - ttl,))
+        self._db.commit()
+    
+    @staticmethod
+    def _normalize(company_name: str) -> str:
+        return company_name.strip().lower()
+    
+    def get(self, company_name: str) -> Optional[str]:
+        """Return the cached ticker for a company, checking RAM first and disk second"""
+        return self.get_many([company_name]).get(company_name)
+    
+    def get_many(self, company_names: List[str]) -> Dict[str, str]:
+        """Return the cached tickers for the companies that have one; disk errors count as misses"""
+        found = {}
+        with self._lock:
+            for company_name in company_names:
+                key = self._normalize(company_name)
+                ticker = self._memory.get(key)
+                if ticker is None:
+                    try:
+                        row = self._db.execute(
+                            "SELECT ticker FROM tickers WHERE company = ? AND updated_at >= ?",
+                            (key, time.time() - self.ttl)
+                        ).fetchone()
+                    except sqlite3.Error as e:
+                        logger.warning("Ticker cache read failed for %s: %s", company_name, e)
+                        continue
+                    if row is None:
+                        continue
+                    ticker = self._memory[key] = row[0]
+                found[company_name] = ticker
+        return found
+    
+    def set(self, company_name: str, ticker: str):
+        """Store a resolved ticker; unresolved lookups are never cached"""
+        self.set_many({company_name: ticker})
+    
+    def set_many(self, tickers: Dict[str, str]):
+        """Store resolved tickers in one transaction; disk errors are logged, never raised"""
+        rows = [
+            (self._normalize(company_name), ticker, time.time())
+            for company_name, ticker in tickers.items()
+            if ticker != "UNKNOWN"
+        ]
+        if not rows:
+            return
+        
+        with self._lock:
+            for key, ticker, _ in rows:
+                self._memory[key] = ticker
+            try:
+                with self._db:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO tickers (company, ticker, updated_at) VALUES (?, ?, ?)",
+                        rows
+                    )
+            except sqlite3.Error as e:
+                logger.warning("Ticker cache write failed: %s", e)
 
 # ============================================================================
 # GROQ CLIENT
@@ -56,13 +209,31 @@ logger = logging.getLogger(__name__)
 
 class GroqClient:
     def __init__(self):
-        if not settings.GROQ_API_KEY:
+        if not _GROQ_CONFIGURED:
             raise ValueError("GROQ_API_KEY not found in environment variables")
         
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+        # One pooled client for the whole process so keep-alive connections
+        # (and their TLS sessions) are reused across requests
+        timeout = httpx.Timeout(settings.GROQ_TIMEOUT, connect=settings.GROQ_CONNECT_TIMEOUT)
+        self.client = AsyncGroq(
+            api_key=GROQ_KEY,
+            timeout=timeout,
+            http_client=DefaultAioHttpClient(
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.GROQ_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.GROQ_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+        )
         self.model = settings.GROQ_MODEL
+        self.ticker_cache = TickerCache(
+            os.path.join(settings.MODELS_DIR, "ticker_cache.db"),
+            settings.TICKER_CACHE_SIZE,
+            settings.TICKER_CACHE_TTL
+        )
     
-    def summarize_article(self, text: str) -> str:
+    async def summarize_article(self, text: str) -> str:
         """Use Llama3 to generate a concise summary of the article"""
         try:
             prompt = f"""You are a financial news analyst. Summarize the following financial news article in 2-3 sentences, focusing on key financial events, company performance, and market implications.
@@ -72,7 +243,7 @@ Article:
 
 Summary:"""
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 messages=[
                     {
                         "role": "system",
@@ -89,14 +260,14 @@ Summary:"""
             )
             
             summary = response.choices[0].message.content.strip()
-            logger.info(f"Article summarized: {len(summary)} chars")
+            logger.info("Article summarized: %s chars", len(summary))
             return summary
             
         except Exception as e:
-            logger.error(f"Error summarizing article: {e}")
+            logger.error("Error summarizing article: %s", e)
             return "Summary unavailable"
     
-    def extract_companies(self, text: str) -> list:
+    async def extract_companies(self, text: str) -> list:
         """Use Llama3 to extract publicly traded companies mentioned in the article"""
         try:
             prompt = f"""You are a financial analyst. Extract ALL publicly traded companies mentioned in this article.
@@ -112,7 +283,7 @@ Article:
 
 Companies (comma-separated):"""
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 messages=[
                     {
                         "role": "system",
@@ -136,15 +307,96 @@ Companies (comma-separated):"""
             companies = [c.strip() for c in companies_text.split(',')]
             companies = [c for c in companies if c and len(c) > 1]
             
-            logger.info(f"Extracted companies: {companies}")
+            logger.info("Extracted companies: %s", companies)
             return companies
             
         except Exception as e:
-            logger.error(f"Error extracting companies: {e}")
+            logger.error("Error extracting companies: %s", e)
             return []
     
-    def get_ticker_for_company(self, company_name: str) -> str:
+    async def analyze_article_bundle(self, text: str) -> Optional[Dict]:
+        """Use Llama3 to summarize the article and extract companies with tickers in a single call"""
+        try:
+            prompt = f"""You are a financial news analyst. Analyze the following financial news article.
+
+Instructions:
+- Summarize the article in 2-3 sentences, focusing on key financial events, company performance, and market implications
+- Extract ALL publicly traded companies that are directly mentioned or clearly implied
+- For each company, give the company name (e.g., "Apple", "Tesla", "Microsoft") and its most common stock ticker symbol (e.g., AAPL, TSLA, MSFT)
+- Prefer the NYSE/NASDAQ ticker when a company is listed on several exchanges; otherwise use the Yahoo Finance symbol (e.g., SHEL, TM, BP.L)
+- List each company only once
+- If you're not sure about a ticker, use "UNKNOWN"
+- Respond with JSON only, in exactly this format:
+{{"summary": "...", "companies": [{{"name": "...", "ticker": "..."}}]}}
+
+Article:
+{text[:4000]}"""
+
+            response = await self.client.chat.completions.create(
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a financial analyst expert at summarizing financial news and extracting accurate company and stock ticker data. You always respond with valid JSON."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                model=self.model,
+                temperature=0.1,
+                max_tokens=600,
+                response_format={"type": "json_object"}
+            )
+            
+            payload = json.loads(response.choices[0].message.content)
+            
+            summary = str(payload.get("summary") or "").strip() or "Summary unavailable"
+            companies = []
+            for entry in payload.get("companies") or []:
+                if not isinstance(entry, dict):
+                    continue
+                name = str(entry.get("name") or "").strip()
+                if len(name) <= 1:
+                    continue
+                ticker = str(entry.get("ticker") or "").strip().upper()
+                ticker = ticker.split()[0] if ticker else "UNKNOWN"
+                companies.append({"name": name, "ticker": ticker})
+            
+            # SQLite I/O stays off the event loop: one read for the unknowns, one write for the rest
+            unknown = [c["name"] for c in companies if c["ticker"] == "UNKNOWN"]
+            if unknown:
+                cached = await asyncio.to_thread(self.ticker_cache.get_many, unknown)
+                for company in companies:
+                    company["ticker"] = cached.get(company["name"], company["ticker"])
+            await asyncio.to_thread(
+                self.ticker_cache.set_many,
+                {c["name"]: c["ticker"] for c in companies if c["name"] not in unknown}
+            )
+            
+            logger.info("Article bundle: summary %s chars, companies %s", len(summary), companies)
+            return {
+                "summary": summary,
+                "companies": companies
+            }
+            
+        except Exception as e:
+            logger.error("Error analyzing article bundle: %s", e)
+            return None
+    
+    async def get_tickers_for_companies(self, company_names: List[str]) -> Dict[str, str]:
+        """Look up stock tickers for several companies concurrently"""
+        unique_names = list(dict.fromkeys(company_names))
+        tickers = await asyncio.gather(*(self.get_ticker_for_company(n) for n in unique_names))
+        return dict(zip(unique_names, tickers))
+    
+    async def get_ticker_for_company(self, company_name: str) -> str:
         """Use Llama3 to get stock ticker for a company name"""
+        cached = await asyncio.to_thread(self.ticker_cache.get, company_name)
+        if cached is not None:
+            logger.info("Ticker for %s: %s (cached)", company_name, cached)
+            return cached
+        
         try:
             prompt = f"""What is the stock ticker symbol for {company_name}?
 
@@ -156,7 +408,7 @@ Instructions:
 
 Ticker:"""
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 messages=[
                     {
                         "role": "system",
@@ -175,152 +427,665 @@ Ticker:"""
             ticker = response.choices[0].message.content.strip().upper()
             ticker = ticker.split()[0] if ticker else "UNKNOWN"
             
-            logger.info(f"Ticker for {company_name}: {ticker}")
-            return ticker
+            logger.info("Ticker for %s: %s", company_name, ticker)
             
         except Exception as e:
-            logger.error(f"Error getting ticker for {company_name}: {e}")
+            logger.error("Error getting ticker for %s: %s", company_name, e)
             return "UNKNOWN"
+        
+        await asyncio.to_thread(self.ticker_cache.set, company_name, ticker)
+        return ticker
 
 # ============================================================================
 # FINBERT NLP
 # ============================================================================
 
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+_SENTIMENT_LABELS = ("negative", "neutral", "positive")
+_NO_MENTION_SENTIMENT = ("neutral", 0.0, {"negative": 0.0, "neutral": 1.0, "positive": 0.0})
+
+def _relevant_texts(text: str, company_names: List[str]) -> Dict[str, Optional[str]]:
+    """Collect the sentences of the text that mention each company in one scan (None if never mentioned)"""
+    if not company_names:
+        return {}
+    
+    needles = {}
+    for company_name in company_names:
+        needles.setdefault(company_name.lower(), []).append(company_name)
+    
+    # One case-insensitive alternation matches every name as a whole word in a
+    # single pass per sentence. At each position only the longest alternative
+    # is reported, so names contained in a matched name are added back explicitly.
+    ordered = sorted(needles, key=len, reverse=True)
+    matcher = re.compile(
+        r"(?=(?<!\w)(" + "|".join(map(re.escape, ordered)) + r")(?!\w))",
+        re.IGNORECASE
+    )
+    contained = {
+        needle: [
+            other for other in ordered
+            if other != needle and re.search(r"(?<!\w)" + re.escape(other) + r"(?!\w)", needle)
+        ]
+        for needle in ordered
+    }
+    
+    mentions = {company_name: [] for company_name in company_names}
+    for sentence in _SENTENCE_SPLIT.split(text):
+        found = set()
+        for match in matcher.finditer(sentence):
+            needle = match.group(1).lower()
+            found.add(needle)
+            found.update(contained[needle])
+        
+        for needle in found:
+            for company_name in needles[needle]:
+                mentions[company_name].append(sentence)
+    
+    return {
+        company_name: ' '.join(relevant_sentences[:5]) if relevant_sentences else None
+        for company_name, relevant_sentences in mentions.items()
+    }
+
 class FinancialNLP:
     def __init__(self):
         self.tokenizer = None
         self.model = None
+        use_cuda = settings.FINBERT_BACKEND == "torch" and torch.cuda.is_available()
+        self.device = torch.device("cuda" if use_cuda else "cpu")
+        # Dynamic INT8 quantization needs FP32 weights and only runs on CPU
+        self._quantize = settings.FINBERT_QUANTIZE and settings.FINBERT_BACKEND == "torch" and not use_cuda
+        # Reduced precision: FP16 on GPU, opt-in BF16 on CPU
+        if use_cuda:
+            self._autocast_dtype = torch.float16
+        elif settings.FINBERT_BF16 and settings.FINBERT_BACKEND == "torch" and not self._quantize:
+            self._autocast_dtype = torch.bfloat16
+        else:
+            self._autocast_dtype = None
+        self._sentiment_cache = LRUCache(maxsize=settings.SENTIMENT_CACHE_SIZE)
+        self._company_cache = LRUCache(maxsize=settings.SENTIMENT_CACHE_SIZE)
+        self._cache_lock = threading.Lock()
         self._load_model()
     
     def _load_model(self):
         """Load FinBERT model"""
         try:
-            logger.info(f"Loading FinBERT model: {settings.FINBERT_MODEL}")
-            self.tokenizer = AutoTokenizer.from_pretrained(settings.FINBERT_MODEL)
-            self.model = AutoModelForSequenceClassification.from_pretrained(settings.FINBERT_MODEL)
-            logger.info("FinBERT model loaded successfully")
+            logger.info("Loading FinBERT model: %s", settings.FINBERT_MODEL)
+            self.tokenizer = AutoTokenizer.from_pretrained(
+                settings.FINBERT_MODEL,
+                revision=settings.FINBERT_MODEL_REV,
+                use_fast=True
+            )
+            if not isinstance(self.tokenizer, PreTrainedTokenizerFast):
+                raise RuntimeError("FinBERT requires the fast (Rust) tokenizer; install the `tokenizers` package")
+            self.tokenizer("Warm-up", truncation=True, max_length=settings.MAX_TEXT_LENGTH)
+            if settings.FINBERT_BACKEND == "onnx":
+                self.model = self._load_onnx_model()
+            elif settings.FINBERT_BACKEND == "torchscript":
+                self.model = self._load_torchscript_model()
+            else:
+                # Load weights straight into the target dtype without a full FP32 copy
+                self.model = self._optimize_torch_model(
+                    AutoModelForSequenceClassification.from_pretrained(
+                        settings.FINBERT_MODEL,
+                        revision=settings.FINBERT_MODEL_REV,
+                        torch_dtype=self._autocast_dtype or torch.float32
+                    )
+                )
+            logger.info("FinBERT model loaded successfully (%s backend)", settings.FINBERT_BACKEND)
         except Exception as e:
-            logger.error(f"Failed to load model: {e}")
+            logger.error("Failed to load model: %s", e)
             raise
     
-    def analyze_sentiment_for_company(self, text: str, company_name: str) -> Tuple[str, float, Dict[str, float]]:
-        """Analyze sentiment for a specific company in the text"""
-        sentences = text.split('.')
-        relevant_sentences = [
-            s for s in sentences 
-            if company_name.lower() in s.lower()
-        ]
+    @staticmethod
+    def _resolve_model_commit() -> str:
+        """Commit hash FINBERT_MODEL_REV resolves to, read from the downloaded snapshot path"""
+        config_path = cached_file(settings.FINBERT_MODEL, "config.json", revision=settings.FINBERT_MODEL_REV)
+        commit = os.path.basename(os.path.dirname(config_path))
+        if commit != settings.FINBERT_MODEL_REV:
+            logger.warning(
+                "FINBERT_MODEL_REV=%s is a moving ref; set FINBERT_MODEL_REV=%s to pin this download",
+                settings.FINBERT_MODEL_REV, commit
+            )
+        return commit
+    
+    def _optimize_torch_model(self, model):
+        """Place the PyTorch model on its device and apply INT8 quantization and torch.compile"""
+        model = model.to(self.device).eval()
         
-        if not relevant_sentences:
-            relevant_text = text[:settings.MAX_TEXT_LENGTH * 2]
-        else:
-            relevant_text = '. '.join(relevant_sentences[:5])
+        if self.device.type == "cuda":
+            torch.backends.cuda.matmul.allow_tf32 = True
+        elif settings.TORCH_NUM_THREADS > 0:
+            torch.set_num_threads(settings.TORCH_NUM_THREADS)
+        
+        if self._quantize:
+            is_arm = platform.machine().lower() in ("arm64", "aarch64")
+            torch.backends.quantized.engine = "qnnpack" if is_arm else "fbgemm"
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        
+        if settings.FINBERT_COMPILE == "true" or (
+            settings.FINBERT_COMPILE == "auto" and self.device.type == "cuda"
+        ):
+            model = torch.compile(model, mode="reduce-overhead")
         
-        return self.analyze_sentiment(relevant_text)
+        return model
     
-    def analyze_sentiment(self, text: str) -> Tuple[str, float, Dict[str, float]]:
-        """Analyze sentiment using FinBERT"""
+    def _load_torchscript_model(self):
+        """Load a frozen TorchScript trace of FinBERT, tracing and saving it on first use"""
+        if settings.TORCH_NUM_THREADS > 0:
+            torch.set_num_threads(settings.TORCH_NUM_THREADS)
+        
+        # Keyed on the resolved commit so an upstream model change is re-traced
+        path = os.path.join(settings.MODELS_DIR, f"finbert_traced_{self._resolve_model_commit()}.pt")
+        if os.path.exists(path):
+            return torch.jit.load(path, map_location=self.device)
+        
+        logger.info("Tracing FinBERT to TorchScript: %s", path)
+        model = AutoModelForSequenceClassification.from_pretrained(
+            settings.FINBERT_MODEL,
+            revision=settings.FINBERT_MODEL_REV,
+            torchscript=True
+        ).eval()
+        example = self.tokenizer(
+            "Warm-up",
+            return_tensors="pt",
+            padding="max_length",
+            max_length=settings.MAX_TEXT_LENGTH
+        )
+        # no_grad rather than inference_mode: inference tensors captured as trace
+        # constants can't be used outside inference mode
+        with torch.no_grad():
+            traced = torch.jit.trace(model, (example["input_ids"], example["attention_mask"]))
+        traced = torch.jit.freeze(traced)
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        torch.jit.save(traced, path)
+        return traced
+    
+    def _load_onnx_model(self):
+        """Load FinBERT as an INT8-quantized ONNX Runtime model, exporting it on first use"""
+        from onnxruntime import GraphOptimizationLevel, SessionOptions
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        
+        quantized_file = "model_quantized.onnx"
+        onnx_dir = os.path.join(settings.MODELS_DIR, f"finbert_onnx_int8_{self._resolve_model_commit()}")
+        
+        if not os.path.exists(os.path.join(onnx_dir, quantized_file)):
+            logger.info("Exporting FinBERT to ONNX with INT8 quantization: %s", onnx_dir)
+            onnx_model = ORTModelForSequenceClassification.from_pretrained(
+                settings.FINBERT_MODEL,
+                revision=settings.FINBERT_MODEL_REV,
+                export=True
+            )
+            quantizer = ORTQuantizer.from_pretrained(onnx_model)
+            quantizer.quantize(
+                save_dir=onnx_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+        
+        session_options = SessionOptions()
+        session_options.graph_optimization_level = GraphOptimizationLevel.ORT_ENABLE_ALL
+        session_options.intra_op_num_threads = settings.ORT_NUM_THREADS
+        
+        return ORTModelForSequenceClassification.from_pretrained(
+            onnx_dir,
+            file_name=quantized_file,
+            session_options=session_options,
+            provider="CPUExecutionProvider"
+        )
+    
+    @staticmethod
+    def _text_key(text: str) -> str:
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+    
+    def _predict_torch(self, texts: List[str]) -> torch.Tensor:
+        """Class probabilities from the PyTorch model, as a CPU tensor"""
         inputs = self.tokenizer(
-            text,
+            texts,
             return_tensors="pt",
             truncation=True,
             max_length=settings.MAX_TEXT_LENGTH,
-            padding=True
+            # The trace was recorded at MAX_TEXT_LENGTH tokens, so feed it that length
+            padding="max_length" if settings.FINBERT_BACKEND == "torchscript"
+            else "longest" if len(texts) > 1 else False,
+            # Fewer distinct shapes for compiled CUDA graphs, tensor-core friendly sizes
+            pad_to_multiple_of=8 if self.device.type == "cuda" else None
         )
         
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
+        if self.device.type == "cuda":
+            inputs = {
+                k: v.pin_memory().to(self.device, non_blocking=True)
+                for k, v in inputs.items()
+            }
         
-        sentiment_scores = {
-            "negative": predictions[0][0].item(),
-            "neutral": predictions[0][1].item(),
-            "positive": predictions[0][2].item()
-        }
+        with torch.inference_mode(), torch.autocast(
+            device_type=self.device.type,
+            dtype=self._autocast_dtype or torch.bfloat16,
+            enabled=self._autocast_dtype is not None
+        ):
+            if settings.FINBERT_BACKEND == "torchscript":
+                # Traced modules take positional tensors and return a tuple
+                logits = self.model(inputs["input_ids"], inputs["attention_mask"])[0]
+            else:
+                logits = self.model(**inputs).logits
+            return torch.nn.functional.softmax(logits.float(), dim=-1).cpu()
+    
+    def _predict_onnx(self, texts: List[str]) -> np.ndarray:
+        """Class probabilities from the ONNX Runtime model, computed without torch tensors"""
+        inputs = self.tokenizer(
+            texts,
+            return_tensors="np",
+            truncation=True,
+            max_length=settings.MAX_TEXT_LENGTH,
+            padding="longest" if len(texts) > 1 else False
+        )
+        
+        logits = self.model(**inputs).logits
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return exp / exp.sum(axis=-1, keepdims=True)
+    
+    def _predict_batch(self, texts: List[str]) -> List[Tuple[str, float, Dict[str, float]]]:
+        """Run a single FinBERT forward pass over all texts"""
+        # Attention cost grows with sequence length, so never pay for padding or
+        # stray whitespace: single texts are unpadded, batches pad to the longest
+        texts = [t.strip() for t in texts]
+        
+        if settings.FINBERT_BACKEND == "onnx":
+            predictions = self._predict_onnx(texts)
+        else:
+            predictions = self._predict_torch(texts)
+        
+        # One conversion for the whole (N, 3) batch instead of an .item() per cell
+        results = []
+        for probs in predictions.tolist():
+            sentiment_scores = dict(zip(_SENTIMENT_LABELS, probs))
+            
+            dominant_sentiment = max(sentiment_scores, key=sentiment_scores.get)
+            confidence = sentiment_scores[dominant_sentiment]
+            
+            logger.info("Sentiment: %s (%.2f%%)", dominant_sentiment, confidence * 100)
+            results.append((dominant_sentiment, confidence, sentiment_scores))
+        
+        return results
+    
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[Tuple[str, float, Dict[str, float]]]:
+        """Analyze sentiment for many texts, running one FinBERT forward pass over the uncached ones"""
+        keys = [self._text_key(t) for t in texts]
+        results = {}
+        
+        with self._cache_lock:
+            for key in keys:
+                cached = self._sentiment_cache.get(key)
+                if cached is not None:
+                    results[key] = cached
+        
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in results:
+                pending.setdefault(key, text)
+        
+        if pending:
+            predictions = self._predict_batch(list(pending.values()))
+            with self._cache_lock:
+                for key, result in zip(pending, predictions):
+                    self._sentiment_cache[key] = result
+                    results[key] = result
+        
+        return [results[key] for key in keys]
+    
+    def analyze_sentiments_many(self, batch: List[Tuple[str, List[str]]]) -> List[Dict[str, Tuple[str, float, Dict[str, float]]]]:
+        """Analyze company sentiment for several (text, company_names) requests with one batched FinBERT pass"""
+        results = [{} for _ in batch]
+        misses = []  # (request index, company name, cache key)
+        
+        with self._cache_lock:
+            for i, (text, company_names) in enumerate(batch):
+                article_hash = hashlib.sha256(text.encode()).hexdigest()
+                for company_name in company_names:
+                    key = (article_hash, company_name.lower())
+                    cached = self._company_cache.get(key)
+                    if cached is not None:
+                        results[i][company_name] = cached
+                    else:
+                        misses.append((i, company_name, key))
+        
+        if misses:
+            names_by_request = {}
+            for i, company_name, _ in misses:
+                names_by_request.setdefault(i, []).append(company_name)
+            
+            texts = []
+            for i, names in names_by_request.items():
+                relevant_texts = _relevant_texts(batch[i][0], names)
+                texts.extend(relevant_texts[c] for c in names)
+            
+            # Companies the text never mentions carry no signal, so skip their forward pass
+            predictions = iter(self.analyze_sentiment_batch([t for t in texts if t is not None]))
+            
+            with self._cache_lock:
+                for (i, company_name, key), relevant_text in zip(misses, texts):
+                    result = _NO_MENTION_SENTIMENT if relevant_text is None else next(predictions)
+                    self._company_cache[key] = result
+                    results[i][company_name] = result
         
-        dominant_sentiment = max(sentiment_scores, key=sentiment_scores.get)
-        confidence = sentiment_scores[dominant_sentiment]
+        return results
+    
+    def analyze_sentiments_batch(self, text: str, company_names: List[str]) -> Dict[str, Tuple[str, float, Dict[str, float]]]:
+        """Analyze sentiment for several companies in the text with one batched FinBERT pass"""
+        return self.analyze_sentiments_many([(text, company_names)])[0]
+    
+    def analyze_sentiment_for_company(self, text: str, company_name: str) -> Tuple[str, float, Dict[str, float]]:
+        """Analyze sentiment for a specific company in the text"""
+        return self.analyze_sentiments_batch(text, [company_name])[company_name]
+    
+    def analyze_sentiment(self, text: str) -> Tuple[str, float, Dict[str, float]]:
+        """Analyze sentiment using FinBERT"""
+        return self.analyze_sentiment_batch([text])[0]
+
+# ============================================================================
+# FAST SENTIMENT (VADER)
+# ============================================================================
+
+class VaderFast:
+    """Lexicon-based VADER sentiment for the fast analysis mode"""
+    
+    def __init__(self):
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        self.sia = SentimentIntensityAnalyzer()
+    
+    def analyze(self, text: str) -> Dict[str, float]:
+        """VADER polarity scores (neg, neu, pos, compound)"""
+        return self.sia.polarity_scores(text)
+    
+    def analyze_companies(self, text: str, company_names: List[str]) -> Dict[str, Tuple[str, float, Dict[str, float]]]:
+        """Score each company with VADER, leaving out the uncertain ones for FinBERT"""
+        results = {}
         
-        logger.info(f"Sentiment: {dominant_sentiment} ({confidence:.2%})")
-        return dominant_sentiment, confidence, sentiment_scores
+        for company_name, relevant_text in _relevant_texts(text, company_names).items():
+            if relevant_text is None:
+                results[company_name] = _NO_MENTION_SENTIMENT
+                continue
+            
+            scores = self.analyze(relevant_text)
+            compound = scores["compound"]
+            if abs(compound) < settings.VADER_THRESHOLD:
+                continue
+            
+            results[company_name] = (
+                "positive" if compound > 0 else "negative",
+                abs(compound),
+                {"negative": scores["neg"], "neutral": scores["neu"], "positive": scores["pos"]}
+            )
+        
+        return results
+
+# ============================================================================
+# SENTIMENT BATCHER
+# ============================================================================
+
+class SentimentBatcher:
+    """Single FinBERT worker that micro-batches concurrent requests into one forward pass"""
+    
+    def __init__(self, finbert: FinancialNLP, window_ms: float):
+        self.finbert = finbert
+        self.window = window_ms / 1000
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def analyze_sentiments(self, text: str, company_names: List[str]) -> Dict[str, Tuple[str, float, Dict[str, float]]]:
+        """Queue a request for the next batch and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((text, company_names), future))
+        return await future
+    
+    # The only caller of FinBERT in this worker: one batch uses every core, so
+    # running batches one at a time avoids oversubscribing the CPU while the
+    # requests' Groq and YFinance I/O keeps overlapping.
+    async def _run(self):
+        while True:
+            items = [await self._queue.get()]
+            # Give concurrent requests a short window to join this batch
+            await asyncio.sleep(self.window)
+            while not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            
+            try:
+                results = await asyncio.to_thread(
+                    self.finbert.analyze_sentiments_many, [req for req, _ in items]
+                )
+            except Exception as e:
+                logger.error("Batched sentiment analysis failed: %s", e)
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            logger.info("Scored %s sentiment requests in one batch", len(items))
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
 
 # ============================================================================
 # STOCK DATA FETCHER
 # ============================================================================
 
 class StockDataFetcher:
+    # Quotes go stale within seconds; market cap barely moves intraday
+    _quote_cache = TTLCache(maxsize=settings.STOCK_CACHE_SIZE, ttl=settings.STOCK_CACHE_TTL)
+    _market_cap_cache = TTLCache(maxsize=settings.STOCK_CACHE_SIZE, ttl=settings.MARKET_CAP_CACHE_TTL)
+    _cache_lock = threading.RLock()
+    
+    # yf.download collects results in a module-global dict that every call resets,
+    # so concurrent downloads would overwrite or drop each other's quotes
+    _download_lock = threading.Lock()
+    
+    # Shared pool for per-ticker market cap requests; the GIL is released during socket I/O
+    _market_cap_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="market-cap")
+    
+    # One keep-alive connection pool for every Yahoo request instead of a TLS handshake per ticker
+    _session = requests.Session()
+    _session.mount("https://", HTTPAdapter(pool_connections=settings.YF_BATCH_SIZE, pool_maxsize=settings.YF_BATCH_SIZE))
+    
+    # What yfinance's market cap lookups raise for missing or malformed data
+    # (ValueError covers JSONDecodeError) and for network failures
+    _MARKET_CAP_ERRORS = (KeyError, AttributeError, TypeError, ValueError, requests.RequestException)
+    
+    # (scale, suffix) indexed by the number of thousands groups in the market cap
+    _MARKET_CAP_UNITS = (
+        (1, ""),
+        (1, ""),
+        (1_000_000, "M"),
+        (1_000_000_000, "B"),
+        (1_000_000_000_000, "T")
+    )
+    
+    @staticmethod
+    def _cache_quote(stock_data: Dict):
+        """Remember successful quotes only, so failures are retried on the next request"""
+        if stock_data["status"] == "success":
+            with StockDataFetcher._cache_lock:
+                StockDataFetcher._quote_cache[stock_data["ticker"]] = stock_data
+    
+    @staticmethod
+    def _get_market_cap(ticker: str, stock: Optional[yf.Ticker]) -> int:
+        """Read market cap, served from the long-lived cache when possible.
+        
+        fast_info is tried first; the full (slow) info scrape is only a fallback for
+        tickers where fast_info has no market cap, and its answer is cached either way.
+        Lookup failures fall back to 0 rather than failing the quote.
+        """
+        with StockDataFetcher._cache_lock:
+            market_cap = StockDataFetcher._market_cap_cache.get(ticker)
+        if market_cap is not None:
+            return market_cap
+        
+        if stock is None:
+            stock = yf.Ticker(ticker, session=StockDataFetcher._session)
+        
+        try:
+            market_cap = int(getattr(stock.fast_info, "market_cap", 0) or 0)
+        except StockDataFetcher._MARKET_CAP_ERRORS:
+            market_cap = 0
+        
+        if not market_cap:
+            try:
+                market_cap = int(stock.get_info().get('marketCap') or 0)
+            except StockDataFetcher._MARKET_CAP_ERRORS as e:
+                logger.warning("Market cap unavailable for %s: %s", ticker, e)
+                return 0
+        
+        with StockDataFetcher._cache_lock:
+            StockDataFetcher._market_cap_cache[ticker] = market_cap
+        return market_cap
+    
+    @staticmethod
+    def _empty_stock_data(ticker: str, status: str) -> Dict:
+        """Placeholder stock data for tickers without usable market data"""
+        return {
+            "ticker": ticker,
+            "price": 0.0,
+            "change_pct": 0.0,
+            "volume": 0,
+            "market_cap": 0,
+            "day_high": 0.0,
+            "day_low": 0.0,
+            "status": status
+        }
+    
+    @staticmethod
+    def _quote_from_history(ticker: str, hist: pd.DataFrame) -> Dict:
+        """Build stock data from the last two rows of a price history (market cap filled in later)"""
+        # Pull the columns out as one NumPy array instead of five Series .iloc lookups
+        prices = hist[['Close', 'High', 'Low', 'Volume']].to_numpy(dtype=float)
+        current_price, day_high, day_low, volume = prices[-1]
+        prev_price = prices[-2, 0]
+        change_pct = ((current_price - prev_price) / prev_price) * 100
+        
+        return {
+            "ticker": ticker,
+            "price": round(float(current_price), 2),
+            "change_pct": round(float(change_pct), 2),
+            "volume": int(volume),
+            "market_cap": 0,
+            "day_high": round(float(day_high), 2),
+            "day_low": round(float(day_low), 2),
+            "status": "success"
+        }
+    
+    @staticmethod
+    def get_many(tickers: List[str]) -> Dict[str, Dict]:
+        """Fetch stock data for several tickers with batched YFinance downloads"""
+        results = {}
+        tickers = list(dict.fromkeys(tickers))
+        
+        with StockDataFetcher._cache_lock:
+            for ticker in tickers:
+                cached = StockDataFetcher._quote_cache.get(ticker)
+                if cached is not None:
+                    results[ticker] = cached
+        
+        misses = [t for t in tickers if t not in results]
+        
+        # Yahoo serves at most ~20 symbols per download request
+        for start in range(0, len(misses), settings.YF_BATCH_SIZE):
+            results.update(StockDataFetcher._download_batch(misses[start:start + settings.YF_BATCH_SIZE]))
+        
+        return results
+    
+    @staticmethod
+    def _download_batch(tickers: List[str]) -> Dict[str, Dict]:
+        """Fetch stock data for one download-sized group of tickers"""
+        results = {}
+        
+        try:
+            logger.info("Fetching stock data for %s", tickers)
+            symbols = " ".join(tickers)
+            session = StockDataFetcher._session
+            with StockDataFetcher._download_lock:
+                data = yf.download(symbols, period="5d", group_by="ticker", threads=True, progress=False, session=session)
+            handles = yf.Tickers(symbols, session=session).tickers
+        except Exception as e:
+            logger.error("Error fetching stock data for %s: %s", tickers, e)
+            for ticker in tickers:
+                results[ticker] = StockDataFetcher._empty_stock_data(ticker, f"Error: {str(e)}")
+            return results
+        
+        for ticker in tickers:
+            try:
+                hist = data[ticker] if isinstance(data.columns, pd.MultiIndex) else data
+                hist = hist.dropna(subset=['Close'])
+                
+                if hist.empty or len(hist) < 2:
+                    logger.warning("Insufficient historical data for %s", ticker)
+                    results[ticker] = StockDataFetcher._empty_stock_data(ticker, "No data available")
+                    continue
+                
+                results[ticker] = StockDataFetcher._quote_from_history(ticker, hist)
+                
+            except Exception as e:
+                logger.error("Error fetching stock data for %s: %s", ticker, e)
+                results[ticker] = StockDataFetcher._empty_stock_data(ticker, f"Error: {str(e)}")
+        
+        # Market cap needs one request per ticker; issue them concurrently
+        priced = [t for t in tickers if results[t]["status"] == "success"]
+        market_caps = StockDataFetcher._market_cap_pool.map(
+            lambda t: StockDataFetcher._get_market_cap(t, handles.get(t)), priced
+        )
+        for ticker, market_cap in zip(priced, market_caps):
+            results[ticker]["market_cap"] = market_cap
+            StockDataFetcher._cache_quote(results[ticker])
+        
+        return results
+    
     @staticmethod
     def get_stock_data(ticker: str) -> Dict:
         """Fetch real-time stock data from YFinance"""
+        with StockDataFetcher._cache_lock:
+            cached = StockDataFetcher._quote_cache.get(ticker)
+        if cached is not None:
+            return cached
+        
         try:
-            logger.info(f"Fetching stock data for {ticker}")
-            stock = yf.Ticker(ticker)
+            logger.info("Fetching stock data for %s", ticker)
+            stock = yf.Ticker(ticker, session=StockDataFetcher._session)
             hist = stock.history(period="5d")
             
             if hist.empty or len(hist) < 2:
-                logger.warning(f"Insufficient historical data for {ticker}")
-                return {
-                    "ticker": ticker,
-                    "price": 0.0,
-                    "change_pct": 0.0,
-                    "volume": 0,
-                    "market_cap": 0,
-                    "day_high": 0.0,
-                    "day_low": 0.0,
-                    "status": "No data available"
-                }
-            
-            current_price = float(hist['Close'].iloc[-1])
-            prev_price = float(hist['Close'].iloc[-2])
-            change_pct = ((current_price - prev_price) / prev_price) * 100
-            
-            try:
-                info = stock.info
-                market_cap = info.get('marketCap', 0)
-                day_high = float(hist['High'].iloc[-1])
-                day_low = float(hist['Low'].iloc[-1])
-                volume = int(hist['Volume'].iloc[-1])
-            except:
-                market_cap = 0
-                day_high = current_price
-                day_low = current_price
-                volume = int(hist['Volume'].iloc[-1]) if 'Volume' in hist else 0
+                logger.warning("Insufficient historical data for %s", ticker)
+                return StockDataFetcher._empty_stock_data(ticker, "No data available")
             
-            return {
-                "ticker": ticker,
-                "price": round(current_price, 2),
-                "change_pct": round(change_pct, 2),
-                "volume": volume,
-                "market_cap": market_cap,
-                "day_high": round(day_high, 2),
-                "day_low": round(day_low, 2),
-                "status": "success"
-            }
+            stock_data = StockDataFetcher._quote_from_history(ticker, hist)
+            stock_data["market_cap"] = StockDataFetcher._get_market_cap(ticker, stock)
+            StockDataFetcher._cache_quote(stock_data)
+            return stock_data
             
         except Exception as e:
-            logger.error(f"Error fetching stock data for {ticker}: {e}")
-            return {
-                "ticker": ticker,
-                "price": 0.0,
-                "change_pct": 0.0,
-                "volume": 0,
-                "market_cap": 0,
-                "day_high": 0.0,
-                "day_low": 0.0,
-                "status": f"Error: {str(e)}"
-            }
+            logger.error("Error fetching stock data for %s: %s", ticker, e)
+            return StockDataFetcher._empty_stock_data(ticker, f"Error: {str(e)}")
     
     @staticmethod
     def format_market_cap(market_cap: int) -> str:
         """Format market cap in human-readable format"""
-        if market_cap >= 1_000_000_000_000:
-            return f"${market_cap / 1_000_000_000_000:.2f}T"
-        elif market_cap >= 1_000_000_000:
-            return f"${market_cap / 1_000_000_000:.2f}B"
-        elif market_cap >= 1_000_000:
-            return f"${market_cap / 1_000_000:.2f}M"
-        else:
+        if market_cap <= 0:
+            return "$0"
+        
+        group = min(int(math.log10(market_cap)) // 3, len(StockDataFetcher._MARKET_CAP_UNITS) - 1)
+        scale, suffix = StockDataFetcher._MARKET_CAP_UNITS[group]
+        if not suffix:
             return f"${market_cap:,.0f}"
+        return f"${market_cap / scale:.2f}{suffix}"
 
 # ============================================================================
 # ANALYSIS FUNCTIONS
@@ -343,19 +1108,47 @@ def predict_impact(sentiment: str, score: float, change_pct: float) -> str:
     else:
         return "Neutral outlook - Limited immediate impact expected"
 
-def analyze_article(text: str, groq_client: GroqClient, finbert: FinancialNLP, 
-                   stock_fetcher: StockDataFetcher) -> Dict:
+# predict_impact outcomes indexed by (sentiment code, score tier, price move):
+# sentiment codes follow _SENTIMENT_LABELS, tiers split scores at 0.5 and 0.7,
+# and the move bit is a >2% change in the sentiment's direction.
+_IMPACT_SCORE_BOUNDS = np.array([0.5, 0.7])
+_IMPACT_TABLE = np.array([
+    predict_impact(label, score, change)
+    for label, directional_change in zip(_SENTIMENT_LABELS, (-3.0, 0.0, 3.0))
+    for score in (0.5, 0.6, 0.8)
+    for change in (0.0, directional_change)
+])
+
+def predict_impacts(sentiments: List[str], scores: List[float], change_pcts: List[float]) -> List[str]:
+    """Vectorized predict_impact over many (sentiment, score, change_pct) rows"""
+    codes = np.array([_SENTIMENT_LABELS.index(s) if s in _SENTIMENT_LABELS else 1 for s in sentiments], dtype=np.intp)
+    tiers = np.searchsorted(_IMPACT_SCORE_BOUNDS, np.asarray(scores, dtype=float))
+    changes = np.asarray(change_pcts, dtype=float)
+    moves = ((codes == 2) & (changes > 2)) | ((codes == 0) & (changes < -2))
+    return _IMPACT_TABLE[(codes * 3 + tiers) * 2 + moves].tolist()
+
+async def analyze_article(text: str, groq_client: GroqClient, sentiment_batcher: SentimentBatcher, 
+                          stock_fetcher: StockDataFetcher, vader: Optional[VaderFast] = None) -> Dict:
     """Main analysis pipeline"""
-    logger.info(f"Starting analysis pipeline for text (length: {len(text)} chars)")
+    logger.info("Starting analysis pipeline for text (length: %s chars)", len(text))
     
     try:
-        # Step 1: Summarize
-        logger.info("Step 1: Summarizing article...")
-        summary = groq_client.summarize_article(text)
+        # Step 1-2: Summarize and extract companies with tickers in one Groq call
+        logger.info("Step 1-2: Summarizing article and extracting companies...")
+        bundle = await groq_client.analyze_article_bundle(text)
+        
+        if bundle is not None:
+            summary = bundle["summary"]
+            company_tickers = {c["name"]: c["ticker"] for c in bundle["companies"]}
+        else:
+            logger.warning("Bundled analysis failed, falling back to separate Groq calls")
+            summary, extracted = await asyncio.gather(
+                groq_client.summarize_article(text),
+                groq_client.extract_companies(text)
+            )
+            company_tickers = dict.fromkeys(extracted, "UNKNOWN")
         
-        # Step 2: Extract companies
-        logger.info("Step 2: Extracting companies...")
-        companies = groq_client.extract_companies(text)
+        companies = list(company_tickers)
         
         if not companies:
             logger.info("No companies found in article")
@@ -365,35 +1158,58 @@ def analyze_article(text: str, groq_client: GroqClient, finbert: FinancialNLP,
                 "total_companies": 0
             }
         
-        logger.info(f"Found {len(companies)} companies: {companies}")
+        logger.info("Found %s companies: %s", len(companies), companies)
         
-        # Step 3-6: Process each company
-        results = []
+        # Step 3: Resolve tickers the bundle could not provide, all in one concurrent batch
+        unknown = [c for c in companies if company_tickers[c] == "UNKNOWN"]
+        if unknown:
+            company_tickers.update(await groq_client.get_tickers_for_companies(unknown))
         
+        resolved = []
         for company_name in companies:
-            logger.info(f"Processing company: {company_name}")
-            
-            ticker = groq_client.get_ticker_for_company(company_name)
-            
+            ticker = company_tickers[company_name]
             if ticker == "UNKNOWN":
-                logger.warning(f"Could not find ticker for {company_name}")
+                logger.warning("Could not find ticker for %s", company_name)
                 continue
+            resolved.append((company_name, ticker))
+        
+        # Step 4-5: Batched FinBERT scoring (shared with concurrent requests)
+        # alongside one batched stock data fetch off the event loop. In fast
+        # mode VADER scores clearly-signed companies and FinBERT only the rest.
+        async def score_sentiments() -> Dict[str, Tuple[str, float, Dict[str, float]]]:
+            company_names = [c for c, _ in resolved]
+            if vader is None:
+                return await sentiment_batcher.analyze_sentiments(text, company_names)
             
-            sentiment, confidence, sentiment_scores = finbert.analyze_sentiment_for_company(
-                text, company_name
-            )
-            
-            stock_data = stock_fetcher.get_stock_data(ticker)
-            impact = predict_impact(sentiment, confidence, stock_data["change_pct"])
+            sentiments = vader.analyze_companies(text, company_names)
+            uncertain = [c for c in company_names if c not in sentiments]
+            if uncertain:
+                sentiments.update(await sentiment_batcher.analyze_sentiments(text, uncertain))
+            return sentiments
+        
+        sentiments, stock_results = await asyncio.gather(
+            score_sentiments(),
+            asyncio.to_thread(stock_fetcher.get_many, [t for _, t in resolved])
+        )
+        
+        # Step 6: Assemble per-company results
+        impacts = predict_impacts(
+            [sentiments[c][0] for c, _ in resolved],
+            [sentiments[c][1] for c, _ in resolved],
+            [stock_results[t]["change_pct"] for _, t in resolved]
+        )
+        results = []
+        
+        for (company_name, ticker), impact in zip(resolved, impacts):
+            sentiment, confidence, sentiment_scores = sentiments[company_name]
+            stock_data = stock_results[ticker]
             
             company_result = {
                 "name": company_name,
                 "ticker": stock_data["ticker"],
                 "sentiment": sentiment,
                 "confidence": round(confidence, 3),
-                "sentiment_scores": {
-                    k: round(v, 3) for k, v in sentiment_scores.items()
-                },
+                "sentiment_scores": sentiment_scores,
                 "stock_data": {
                     "price": stock_data["price"],
                     "change_pct": stock_data["change_pct"],
@@ -409,7 +1225,7 @@ def analyze_article(text: str, groq_client: GroqClient, finbert: FinancialNLP,
             
             results.append(company_result)
         
-        logger.info(f"Analysis complete: {len(results)} companies processed")
+        logger.info("Analysis complete: %s companies processed", len(results))
         
         return {
             "summary": summary,
@@ -418,7 +1234,7 @@ def analyze_article(text: str, groq_client: GroqClient, finbert: FinancialNLP,
         }
         
     except Exception as e:
-        logger.error(f"Error in analysis pipeline: {e}", exc_info=True)
+        logger.error("Error in analysis pipeline: %s", e, exc_info=True)
         raise
 
 # ============================================================================
@@ -426,51 +1242,89 @@ def analyze_article(text: str, groq_client: GroqClient, finbert: FinancialNLP,
 # ============================================================================
 
 # Validate Groq API Key
-if not settings.GROQ_API_KEY:
+if not _GROQ_CONFIGURED:
     logger.warning("WARNING: GROQ_API_KEY not set in .env file")
     groq_client = None
 else:
     try:
         groq_client = GroqClient()
     except Exception as e:
-        logger.error(f"Failed to initialize Groq client: {e}")
+        logger.error("Failed to initialize Groq client: %s", e)
         groq_client = None
 
-# Initialize FinBERT
-try:
-    finbert = FinancialNLP()
-except Exception as e:
-    logger.error(f"Failed to initialize FinBERT: {e}")
-    finbert = None
+# FinBERT is loaded lazily so importing this module (uvicorn's supervisor
+# process, tooling, tests) never pays for the model; workers load it once
+# before serving.
+@lru_cache(maxsize=1)
+def get_finbert() -> Optional[FinancialNLP]:
+    try:
+        return FinancialNLP()
+    except Exception as e:
+        logger.error("Failed to initialize FinBERT: %s", e)
+        return None
+
+@lru_cache(maxsize=1)
+def get_vader() -> Optional[VaderFast]:
+    try:
+        return VaderFast()
+    except ImportError:
+        logger.warning("vaderSentiment not installed, fast mode falls back to FinBERT")
+        return None
 
 # Initialize Stock Fetcher
 stock_fetcher = StockDataFetcher()
 
+# Started per worker once FinBERT is loaded
+sentiment_batcher: Optional[SentimentBatcher] = None
+
 # ============================================================================
-# FLASK APP
+# QUART APP
 # ============================================================================
 
-app = Flask(__name__)
+app = Quart(__name__)
 app.config['SECRET_KEY'] = settings.SECRET_KEY
 app.config['DEBUG'] = settings.DEBUG
+app.config['MAX_CONTENT_LENGTH'] = settings.MAX_CONTENT_LENGTH
+
+@app.before_serving
+async def load_models():
+    global sentiment_batcher
+    finbert = await asyncio.to_thread(get_finbert)
+    if finbert:
+        sentiment_batcher = SentimentBatcher(finbert, settings.FINBERT_BATCH_WINDOW_MS)
+        sentiment_batcher.start()
+
+@app.after_serving
+async def stop_batcher():
+    if sentiment_batcher:
+        await sentiment_batcher.stop()
 
 # Enable CORS
-CORS(app, resources={
-    r"/*": {
-        "origins": settings.CORS_ORIGINS,
-        "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type"]
-    }
-})
+app = cors(
+    app,
+    allow_origin=settings.CORS_ORIGINS,
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Content-Type"]
+)
+
+class ORJSONResponse(Response):
+    default_mimetype = "application/json"
+
+def _ojsonify(obj, status: int = 200) -> ORJSONResponse:
+    """Serialize a response body with orjson instead of the stdlib json encoder"""
+    return ORJSONResponse(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), status=status)
 
 # ============================================================================
 # ROUTES
 # ============================================================================
 
+TEXT_TOO_SHORT_ERROR = f"Text must be at least {settings.MIN_ARTICLE_LENGTH} characters long for meaningful analysis"
+_MIN_ANALYZE_BODY_BYTES = len('{"text":""}') + settings.MIN_ARTICLE_LENGTH
+
 @app.route('/', methods=['GET'])
-def index():
+async def index():
     """Health check endpoint"""
-    return jsonify({
+    return _ojsonify({
         "message": "FinSight API v2.0 - Now powered by Groq + FinBERT",
         "version": settings.API_VERSION,
         "status": "healthy",
@@ -483,11 +1337,11 @@ def index():
     })
 
 @app.route('/health', methods=['GET'])
-def health():
+async def health():
     """Detailed health check"""
-    groq_status = "configured" if settings.GROQ_API_KEY else "missing"
+    groq_status = "configured" if _GROQ_CONFIGURED else "missing"
     
-    return jsonify({
+    return _ojsonify({
         "status": "healthy",
         "api_version": settings.API_VERSION,
         "groq_api": groq_status,
@@ -495,58 +1349,89 @@ def health():
     })
 
 @app.route('/analyze', methods=['POST', 'OPTIONS'])
-def analyze():
+async def analyze():
     """Analyze financial news article with enhanced AI pipeline"""
     if request.method == 'OPTIONS':
         return '', 204
     
+    # Smallest body that can hold a long enough article: {"text":"<article>"}
+    content_length = request.content_length
+    if content_length is not None and content_length < _MIN_ANALYZE_BODY_BYTES:
+        return _ojsonify({
+            "error": TEXT_TOO_SHORT_ERROR
+        }, 400)
+    
     try:
-        data = request.get_json()
+        data = await request.get_json(cache=False)
         
         if not data:
-            return jsonify({
+            return _ojsonify({
                 "error": "No JSON data provided"
-            }), 400
+            }, 400)
         
         text = data.get('text', '')
         
-        if not text or len(text) < 100:
-            return jsonify({
-                "error": "Text must be at least 100 characters long for meaningful analysis"
-            }), 400
+        if not text or len(text) < settings.MIN_ARTICLE_LENGTH:
+            return _ojsonify({
+                "error": TEXT_TOO_SHORT_ERROR
+            }, 400)
         
         if not groq_client:
-            return jsonify({
+            return _ojsonify({
                 "error": "GROQ_API_KEY not configured. Please add it to .env file"
-            }), 500
+            }, 500)
         
-        if not finbert:
-            return jsonify({
+        if not sentiment_batcher:
+            return _ojsonify({
                 "error": "FinBERT model not loaded. Check server logs."
-            }), 500
+            }, 500)
         
-        result = analyze_article(text, groq_client, finbert, stock_fetcher)
+        # "fast" scores clearly-signed companies with VADER instead of FinBERT
+        vader = get_vader() if data.get('mode') == 'fast' else None
         
-        return jsonify(result), 200
+        result = await analyze_article(text, groq_client, sentiment_batcher, stock_fetcher, vader)
         
+        return _ojsonify(result, 200)
+        
+    except HTTPException:
+        # e.g. 413 from get_json on an oversized body, handled by its errorhandler
+        raise
     except Exception as e:
-        logger.error(f"Error during analysis: {e}", exc_info=True)
-        return jsonify({
+        logger.error("Error during analysis: %s", e, exc_info=True)
+        return _ojsonify({
             "error": str(e),
             "message": "Analysis failed. Check server logs for details."
-        }), 500
+        }, 500)
+
+@app.errorhandler(400)
+async def bad_request(error):
+    return _ojsonify({
+        "error": "Request body is not valid JSON"
+    }, 400)
 
 @app.errorhandler(404)
-def not_found(error):
-    return jsonify({
+async def not_found(error):
+    return _ojsonify({
         "error": "Endpoint not found"
-    }), 404
+    }, 404)
+
+@app.errorhandler(413)
+async def payload_too_large(error):
+    return _ojsonify({
+        "error": f"Request body exceeds {settings.MAX_CONTENT_LENGTH // 1024} KB limit"
+    }, 413)
+
+@app.errorhandler(415)
+async def unsupported_media_type(error):
+    return _ojsonify({
+        "error": "Content-Type must be application/json"
+    }, 415)
 
 @app.errorhandler(500)
-def internal_error(error):
-    return jsonify({
+async def internal_error(error):
+    return _ojsonify({
         "error": "Internal server error"
-    }), 500
+    }, 500)
 
 # ============================================================================
 # MAIN
@@ -554,7 +1439,7 @@ def internal_error(error):
 
 if __name__ == '__main__':
     # Validate Groq API key on startup
-    if not settings.GROQ_API_KEY:
+    if not _GROQ_CONFIGURED:
         logger.error("=" * 60)
         logger.error("ERROR: GROQ_API_KEY not found!")
         logger.error("Please create .env file with:")
@@ -562,8 +1447,17 @@ if __name__ == '__main__':
         logger.error("Get your key from: https://console.groq.com/")
         logger.error("=" * 60)
     
-    app.run(
+    # Serve the ASGI app with uvicorn so each worker handles many concurrent
+    # requests while they wait on Groq and YFinance. Equivalent to:
+    #   uvicorn main:app --workers N --loop auto
+    # "auto" picks uvloop, which uvicorn[standard] installs everywhere but Windows.
+    # Worker processes must import the app by name; a single worker reuses this
+    # module's app instead of importing (and initializing) everything twice.
+    uvicorn.run(
+        app if settings.API_WORKERS == 1 else "main:app",
         host=settings.API_HOST,
         port=settings.API_PORT,
-        debug=settings.DEBUG
+        workers=settings.API_WORKERS,
+        loop="auto",
+        log_level="debug" if settings.DEBUG else "info"
     )
\ No newline at end of file